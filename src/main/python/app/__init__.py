@@ -1,11 +1,4 @@
 
-from flask import Flask
-from app.api.routes import api_bp
+from app.api.model_api import app
 
-def create_app():
-    app = Flask(__name__)
-
-    # Register blueprints
-    app.register_blueprint(api_bp)
-
-    return app
\ No newline at end of file
+__all__ = ['app']
\ No newline at end of file
@@ -1,35 +1,105 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, ValidationError
+from typing import AsyncIterator
+import asyncio
 import logging
+import msgpack
+from app.config.settings import AppConfig
+from app.services.batch_invoker import BatchInvoker
 from app.services.bedrock_service import BedrockService
+from app.services.response_cache import ResponseCache
 from app.utils.aws_utils import AWSUtils
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Model Invocation API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Size the default executor used by asyncio.to_thread so offloaded work
+    # is not capped at the interpreter's default worker count
+    executor = ThreadPoolExecutor(max_workers=AppConfig.EXECUTOR_MAX_WORKERS)
+    asyncio.get_running_loop().set_default_executor(executor)
+    await aws_utils.warm_up()
+    await batch_invoker.start()
+    yield
+    await batch_invoker.stop()
+    await aws_utils.close_async_clients()
+    executor.shutdown(wait=False)
+
+app = FastAPI(title="Model Invocation API", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Initialize AWS utils and Bedrock service
-aws_utils = AWSUtils()
-bedrock_service = BedrockService(aws_utils)
+aws_utils = AWSUtils(region=AppConfig.AWS_REGION)
+response_cache = ResponseCache(
+    aws_utils,
+    ttl_seconds=AppConfig.CACHE_TTL_SECONDS,
+    max_entries=AppConfig.CACHE_MAX_ENTRIES,
+    semantic_enabled=AppConfig.SEMANTIC_CACHE_ENABLED,
+    similarity_threshold=AppConfig.SEMANTIC_CACHE_THRESHOLD,
+    embedding_model_id=AppConfig.EMBEDDING_MODEL_ID
+)
+bedrock_service = BedrockService(aws_utils, cache=response_cache)
+batch_invoker = BatchInvoker(
+    bedrock_service,
+    max_batch_size=AppConfig.BATCH_MAX_SIZE,
+    max_wait_ms=AppConfig.BATCH_MAX_WAIT_MS
+)
 
 class ModelRequest(BaseModel):
     prompt: str
 
+class ModelCompletion(BaseModel):
+    model_config = ConfigDict(extra='ignore', protected_namespaces=())
+
+    generated_text: str
+    model_id: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
 class ModelResponse(BaseModel):
-    response: Dict[str, Any]
+    response: ModelCompletion
 
 @app.post("/model/invoke", response_model=ModelResponse)
 async def invoke_model(request: ModelRequest):
     try:
-        response = bedrock_service.invoke_model(request.prompt)
+        response = await batch_invoker.submit(request.prompt)
         return ModelResponse(response=response)
     except Exception as e:
-        logger.error(f"Error invoking model: {str(e)}")
+        logger.error("Error invoking model: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/model/invoke.msgpack")
+async def invoke_model_msgpack(raw_request: Request):
+    try:
+        request = ModelRequest.model_validate(msgpack.unpackb(await raw_request.body(), raw=False))
+    except (ValueError, ValidationError, msgpack.UnpackException) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid MessagePack request: {str(e)}")
+
+    try:
+        response = await batch_invoker.submit(request.prompt)
+    except Exception as e:
+        logger.error("Error invoking model: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return Response(msgpack.packb({"response": response}), media_type="application/msgpack")
+
+async def _sse_events(prompt: str) -> AsyncIterator[bytes]:
+    """Frame each model chunk as a server-sent event"""
+    async for chunk in bedrock_service.invoke_model_stream(prompt):
+        yield b'data: ' + chunk + b'\n\n'
+
+@app.post("/model/invoke/stream")
+async def invoke_model_stream(request: ModelRequest):
+    return StreamingResponse(_sse_events(request.prompt), media_type="text/event-stream")
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return {**response_cache.stats(), 'coalesced_requests': bedrock_service.coalesced_requests}
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
\ No newline at end of file
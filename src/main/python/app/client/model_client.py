@@ -1,12 +1,20 @@
-import requests
+import httpx
+import msgpack
+import orjson
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 import logging
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Status codes worth retrying and methods the API allows us to repeat
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+RETRY_METHODS = frozenset(['GET', 'POST'])
+
 class ModelClient:
     def __init__(
             self,
@@ -24,22 +32,57 @@ class ModelClient:
         """
         self.base_url = base_url
         self.timeout = timeout
-        self.session = self._create_session(max_retries)
-
-    def _create_session(self, max_retries: int) -> requests.Session:
-        """Create a session with retry strategy"""
-        session = requests.Session()
-
-        retries = Retry(
-            total=max_retries,
-            backoff_factor=0.5,
-            status_forcelist=[500, 502, 503, 504]
+        self.max_retries = max_retries
+        self.backoff_factor = 0.2
+        self.backoff_jitter = 0.1
+        self.client = self._create_client(max_retries)
+
+    def _create_client(self, max_retries: int) -> httpx.Client:
+        """Create an HTTP/2 client with a persistent connection pool"""
+        transport = httpx.HTTPTransport(
+            http2=True,
+            retries=max_retries,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=100)
         )
+        return httpx.Client(base_url=self.base_url, timeout=self.timeout, transport=transport)
 
-        session.mount('http://', HTTPAdapter(max_retries=retries))
-        session.mount('https://', HTTPAdapter(max_retries=retries))
+    def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """
+        Send a request, retrying retryable status codes with jittered exponential
+        backoff, or after the delay the server asks for via Retry-After
 
-        return session
+        Connection failures are retried by the transport itself.
+        """
+        attempt = 0
+        while True:
+            response = self.client.request(method, path, **kwargs)
+            if (response.status_code not in RETRY_STATUS_CODES
+                    or method not in RETRY_METHODS
+                    or attempt >= self.max_retries):
+                return response
+
+            delay = self._retry_after(response)
+            if delay is None:
+                delay = self.backoff_factor * (2 ** attempt) + random.uniform(0, self.backoff_jitter)
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        """Return the delay requested by a Retry-After header, if any"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
 
     def invoke_model(self, prompt: str) -> Dict[str, Any]:
         """
@@ -51,44 +94,95 @@ class ModelClient:
         Returns:
             Dict[str, Any]: Model response
         """
-        url = f"{self.base_url}/model/invoke"
         headers = {"Content-Type": "application/json"}
-        data = {"prompt": prompt}
+        body = orjson.dumps({"prompt": prompt})
+
+        try:
+            response = self._request(
+                "POST",
+                "/model/invoke",
+                content=body,
+                headers=headers
+            )
+            response.raise_for_status()
+            return orjson.loads(response.content)
+
+        except httpx.TimeoutException:
+            logger.error("Request timed out")
+            raise TimeoutError("Request to model API timed out")
+
+        except httpx.HTTPError as e:
+            logger.error("Error calling model API: %s", e)
+            raise
+
+    def invoke_model_msgpack(self, prompt: str) -> Dict[str, Any]:
+        """
+        Invoke the model API using MessagePack instead of JSON on the wire
+
+        Args:
+            prompt (str): The prompt to send to the model
+
+        Returns:
+            Dict[str, Any]: Model response
+        """
+        headers = {"Content-Type": "application/msgpack", "Accept": "application/msgpack"}
+        body = msgpack.packb({"prompt": prompt})
 
         try:
-            response = self.session.post(
-                url,
-                json=data,
-                headers=headers,
-                timeout=self.timeout
+            response = self._request(
+                "POST",
+                "/model/invoke.msgpack",
+                content=body,
+                headers=headers
             )
             response.raise_for_status()
-            return response.json()
+            return msgpack.unpackb(response.content, raw=False)
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.error("Request timed out")
             raise TimeoutError("Request to model API timed out")
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error calling model API: {str(e)}")
+        except httpx.HTTPError as e:
+            logger.error("Error calling model API: %s", e)
             raise
 
     def health_check(self) -> Dict[str, str]:
         """Check API health status"""
         try:
-            response = self.session.get(
-                f"{self.base_url}/health",
-                timeout=self.timeout
-            )
+            response = self._request("GET", "/health")
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Health check failed: {str(e)}")
+            return orjson.loads(response.content)
+        except httpx.HTTPError as e:
+            logger.error("Health check failed: %s", e)
             raise
 
     def close(self):
-        """Close the session"""
-        self.session.close()
+        """Close the client and its connection pool"""
+        self.client.close()
+
+    def __enter__(self) -> "ModelClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+_default_client: Optional[ModelClient] = None
+
+def get_model_client(
+        base_url: str = "http://localhost:8000",
+        timeout: int = 30,
+        max_retries: int = 3
+) -> ModelClient:
+    """
+    Return a process-wide ModelClient so pooled connections live across calls
+
+    The client is created on first use; later calls return the same instance
+    and ignore the arguments.
+    """
+    global _default_client
+    if _default_client is None:
+        _default_client = ModelClient(base_url, timeout, max_retries)
+    return _default_client
 
 # @contextmanager
 # def model_client(
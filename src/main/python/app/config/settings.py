@@ -11,4 +11,23 @@ class AppConfig:
     AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID')
     AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY')
     AWS_REGION = os.getenv('AWS_REGION', 'us-east-1')
-    BEDROCK_MODEL_ID = os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-v2')
\ No newline at end of file
+    BEDROCK_MODEL_ID = os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-3-5-sonnet-20240620-v1:0')
+
+    # Static system prompt sent with every request and marked for prompt caching.
+    # Keep it byte-identical between calls (no timestamps or per-request data),
+    # otherwise the cached prefix will not match.
+    SYSTEM_PROMPT = os.getenv('SYSTEM_PROMPT', 'You are a helpful assistant.')
+
+    # Worker threads for blocking work offloaded from the event loop
+    EXECUTOR_MAX_WORKERS = int(os.getenv('EXECUTOR_MAX_WORKERS', 64))
+
+    # Micro-batching of concurrent /model/invoke requests
+    BATCH_MAX_SIZE = int(os.getenv('BATCH_MAX_SIZE', 16))
+    BATCH_MAX_WAIT_MS = float(os.getenv('BATCH_MAX_WAIT_MS', 5))
+
+    # Response cache in front of Bedrock
+    CACHE_TTL_SECONDS = int(os.getenv('CACHE_TTL_SECONDS', 3600))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 10000))
+    SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', 'False').lower() == 'true'
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', 0.95))
+    EMBEDDING_MODEL_ID = os.getenv('EMBEDDING_MODEL_ID', 'amazon.titan-embed-text-v1')
\ No newline at end of file
@@ -0,0 +1,114 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+from app.services.bedrock_service import BedrockService
+
+logger = logging.getLogger(__name__)
+
+class BatchInvoker:
+    def __init__(
+            self,
+            bedrock_service: BedrockService,
+            max_batch_size: int = 16,
+            max_wait_ms: float = 5
+    ):
+        """
+        Coalesce prompts that arrive close together into one concurrent Bedrock dispatch
+
+        Args:
+            bedrock_service (BedrockService): Service used to invoke the model
+            max_batch_size (int): Maximum number of prompts dispatched together
+            max_wait_ms (float): How long to wait for more prompts after the first arrives
+        """
+        self.bedrock_service = bedrock_service
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue: Optional["asyncio.Queue[Tuple[str, asyncio.Future]]"] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._dispatches: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Start the background batching loop"""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop batching, failing any prompts that were never dispatched"""
+        if self._worker is None:
+            return
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Batch invoker stopped"))
+
+    async def submit(self, prompt: str) -> Dict[str, Any]:
+        """
+        Queue a prompt for the next batch and wait for its response
+
+        Args:
+            prompt (str): The prompt to send to the model
+
+        Returns:
+            Dict[str, Any]: Model response
+        """
+        if self._worker is None:
+            return await self.bedrock_service.invoke_model(prompt)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((prompt, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Drain the queue into batches and dispatch each without blocking the next"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        """Invoke the model once per distinct prompt and fan results out to every waiter"""
+        waiters: Dict[str, List[asyncio.Future]] = {}
+        for prompt, future in batch:
+            waiters.setdefault(prompt, []).append(future)
+        prompts = list(waiters)
+
+        try:
+            results = await self.bedrock_service.invoke_many(prompts)
+        except Exception as e:
+            results = [e] * len(prompts)
+
+        for prompt, result in zip(prompts, results):
+            for future in waiters[prompt]:
+                # The caller may have gone away while the batch was in flight
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
@@ -1,16 +1,82 @@
-from typing import Dict, Any
-import json
+from typing import AsyncIterator, Dict, Any, List, Optional, Union
+import asyncio
 import logging
+import orjson
+from app.config.settings import AppConfig
+from app.services.response_cache import ResponseCache
 from app.utils.aws_utils import AWSUtils
 
 logger = logging.getLogger(__name__)
 
 class BedrockService:
-    def __init__(self, aws_utils: AWSUtils):
+    def __init__(
+            self,
+            aws_utils: AWSUtils,
+            cache: Optional[ResponseCache] = None,
+            model_id: str = AppConfig.BEDROCK_MODEL_ID,
+            system_prompt: str = AppConfig.SYSTEM_PROMPT
+    ):
         self.aws_utils = aws_utils
-        self.bedrock_runtime = aws_utils.bedrock_runtime
+        self.cache = cache
+        self.model_id = model_id
+        self.system_prompt = system_prompt
 
-    def invoke_model(self, prompt: str) -> Dict[str, Any]:
+        # Single-flight map of request key -> future resolved with the result
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced_requests = 0
+
+        # Messages API parameters shared by every request. The system prompt is
+        # marked with cache_control so Bedrock can reuse the prefilled prefix
+        # across requests instead of reprocessing it.
+        self.request_params = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 2048,
+            "temperature": 0.7,
+            "top_p": 1,
+            "system": [
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ]
+        }
+
+        # Only the prompt varies, so serialize everything around it once
+        self._body_prefix = orjson.dumps(self.request_params)[:-1] + b',"messages":[{"role":"user","content":'
+        self._body_suffix = b'}]}'
+
+    def _build_request_body(self, prompt: str) -> bytes:
+        """Serialize the Messages API request body for Claude model"""
+        return self._body_prefix + orjson.dumps(prompt) + self._body_suffix
+
+    def _parse_response(self, raw_body: bytes) -> Dict[str, Any]:
+        """
+        Extract the completion text and token usage from a Messages API body
+
+        The body is decoded in a single orjson pass; only the content blocks
+        and the usage object are read from the result.
+        """
+        response_body = orjson.loads(raw_body)
+        content = response_body.get('content') or []
+        usage = response_body.get('usage') or {}
+
+        # Claude answers with a single text block in the common case
+        if len(content) == 1 and content[0].get('type') == 'text':
+            generated_text = content[0].get('text', '')
+        else:
+            generated_text = "".join(
+                block.get('text', '') for block in content if block.get('type') == 'text'
+            )
+
+        return {
+            "generated_text": generated_text,
+            "model_id": self.model_id,
+            "prompt_tokens": usage.get('input_tokens', 0),
+            "completion_tokens": usage.get('output_tokens', 0)
+        }
+
+    async def invoke_model(self, prompt: str) -> Dict[str, Any]:
         """
         Invoke AWS Bedrock model with the given prompt
 
@@ -20,32 +86,121 @@ class BedrockService:
         Returns:
             Dict[str, Any]: Model response
         """
+        result = (await self.invoke_many([prompt]))[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def invoke_many(self, prompts: List[str]) -> List[Union[Dict[str, Any], BaseException]]:
+        """
+        Invoke AWS Bedrock model for several prompts concurrently over one client
+
+        Identical requests already in flight, from this call or a concurrent
+        one, are not sent again; they wait for the first call's result.
+
+        Args:
+            prompts (List[str]): The prompts to send to the model
+
+        Returns:
+            List: Model response for each prompt, or the exception raised for it
+        """
+        loop = asyncio.get_running_loop()
+        keys = [ResponseCache.make_key(self.model_id, self.request_params, prompt) for prompt in prompts]
+        results: List[Any] = [None] * len(prompts)
+
+        # Claim every key nobody is working on yet; the rest wait on the owner
+        owned: List[int] = []
+        waiting: Dict[int, asyncio.Future] = {}
+        for index, key in enumerate(keys):
+            future = self._inflight.get(key)
+            if future is None:
+                self._inflight[key] = loop.create_future()
+                owned.append(index)
+            else:
+                waiting[index] = future
+                self.coalesced_requests += 1
+
         try:
-            # Configure the request body for Claude model
-            request_body = {
-                "prompt": prompt,
-                "max_tokens_to_sample": 2048,
-                "temperature": 0.7,
-                "top_p": 1,
-                "stop_sequences": ["\n\nHuman:"]
-            }
-
-            # Invoke the model
-            response = self.bedrock_runtime.invoke_model(
-                modelId="anthropic.claude-v2",
-                body=json.dumps(request_body)
+            await self._resolve(prompts, keys, owned, results)
+        except Exception as e:
+            logger.error("Error invoking Bedrock model: %s", e)
+            for index in owned:
+                if results[index] is None:
+                    results[index] = e
+        finally:
+            # Results, including exceptions, are handed to waiters as values
+            for index in owned:
+                future = self._inflight.pop(keys[index])
+                future.set_result(results[index] if results[index] is not None
+                                  else RuntimeError("Bedrock invocation was cancelled"))
+
+        for index, future in waiting.items():
+            # Shield the shared future so one cancelled waiter does not cancel the rest
+            results[index] = await asyncio.shield(future)
+
+        return results
+
+    async def _resolve(self, prompts: List[str], keys: List[str], indices: List[int], results: List[Any]) -> None:
+        """Fill results for the given indices from the cache or, on a miss, from the model"""
+        embeddings: Dict[int, Any] = {}
+        if self.cache is not None:
+            lookups = await asyncio.gather(
+                *(self.cache.get(keys[index], prompts[index]) for index in indices)
             )
+            for index, (cached, embedding) in zip(indices, lookups):
+                results[index] = cached
+                embeddings[index] = embedding
+
+        misses = [index for index in indices if results[index] is None]
+        if not misses:
+            return
+
+        # Invoke the model without blocking the event loop, sharing one client
+        async with self.aws_utils.bedrock_runtime_ctx() as bedrock_runtime:
+            responses = await asyncio.gather(
+                *(self._call_model(bedrock_runtime, prompts[index]) for index in misses),
+                return_exceptions=True
+            )
+
+        for index, response in zip(misses, responses):
+            if isinstance(response, BaseException):
+                logger.error("Error invoking Bedrock model: %s", response)
+            elif self.cache is not None:
+                self.cache.put(keys[index], response, embeddings.get(index))
+            results[index] = response
+
+    async def _call_model(self, bedrock_runtime, prompt: str) -> Dict[str, Any]:
+        """Send one prompt on an open bedrock-runtime client and parse the reply"""
+        response = await bedrock_runtime.invoke_model(
+            modelId=self.model_id,
+            body=self._build_request_body(prompt)
+        )
+        return self._parse_response(await response['body'].read())
+
+    async def invoke_model_stream(self, prompt: str) -> AsyncIterator[bytes]:
+        """
+        Invoke AWS Bedrock model and yield completion chunks as they are generated
+
+        Args:
+            prompt (str): The prompt to send to the model
+
+        Yields:
+            bytes: Raw JSON chunk emitted by the model
+        """
+        try:
+            request_body = self._build_request_body(prompt)
 
-            # Parse the response
-            response_body = json.loads(response['body'].read())
+            async with self.aws_utils.bedrock_runtime_ctx() as bedrock_runtime:
+                response = await bedrock_runtime.invoke_model_with_response_stream(
+                    modelId=self.model_id,
+                    body=request_body
+                )
 
-            return {
-                "generated_text": response_body.get('completion', ''),
-                "model_id": "anthropic.claude-v2",
-                "prompt_tokens": response_body.get('prompt_tokens', 0),
-                "completion_tokens": response_body.get('completion_tokens', 0)
-            }
+                async for event in response['body']:
+                    chunk = event.get('chunk')
+                    if chunk:
+                        yield chunk['bytes']
 
         except Exception as e:
-            logger.error(f"Error invoking Bedrock model: {str(e)}")
+            logger.error("Error streaming Bedrock model: %s", e)
             raise
\ No newline at end of file
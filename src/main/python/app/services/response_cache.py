@@ -0,0 +1,190 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+import time
+import numpy as np
+import orjson
+from cachetools import LFUCache
+from app.utils.aws_utils import AWSUtils
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    def __init__(
+            self,
+            aws_utils: AWSUtils,
+            ttl_seconds: int = 3600,
+            max_entries: int = 10000,
+            semantic_enabled: bool = False,
+            similarity_threshold: float = 0.95,
+            embedding_model_id: str = 'amazon.titan-embed-text-v1'
+    ):
+        """
+        Two-tier cache for model responses: exact prompt match first, then
+        optional embedding similarity for paraphrased prompts. The exact tier
+        evicts the least frequently used entry once full.
+
+        Args:
+            aws_utils (AWSUtils): AWS helper used to compute prompt embeddings
+            ttl_seconds (int): How long a cached response stays valid
+            max_entries (int): Maximum number of cached responses
+            semantic_enabled (bool): Whether to use the embedding-based tier
+            similarity_threshold (float): Minimum cosine similarity for a semantic hit
+            embedding_model_id (str): Bedrock model used to embed prompts
+        """
+        self.aws_utils = aws_utils
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.semantic_enabled = semantic_enabled
+        self.similarity_threshold = similarity_threshold
+        self.embedding_model_id = embedding_model_id
+
+        # key -> (expires_at, response)
+        self._entries: "LFUCache[str, Tuple[float, Dict[str, Any]]]" = LFUCache(maxsize=max_entries)
+
+        # Semantic index: row i of the matrix is the normalized embedding of keys[i].
+        # Replaced as a whole on every update so a search running in a worker
+        # thread always sees a consistent snapshot.
+        self._index: Tuple[List[str], Optional[np.ndarray]] = ([], None)
+
+        self._exact_hits = 0
+        self._semantic_hits = 0
+        self._misses = 0
+        self._similarity_total = 0.0
+
+    @staticmethod
+    def make_key(model_id: str, params: Dict[str, Any], prompt: str) -> str:
+        """
+        Build the exact-match cache key for a request
+
+        Args:
+            model_id (str): Bedrock model ID
+            params (Dict[str, Any]): Inference parameters excluding the prompt
+            prompt (str): The prompt sent to the model
+
+        Returns:
+            str: SHA-256 hex digest identifying the request
+        """
+        digest = hashlib.sha256()
+        digest.update(model_id.encode('utf-8'))
+        digest.update(orjson.dumps(params, option=orjson.OPT_SORT_KEYS))
+        digest.update(prompt.encode('utf-8'))
+        return digest.hexdigest()
+
+    async def get(self, key: str, prompt: str) -> Tuple[Optional[Dict[str, Any]], Optional[np.ndarray]]:
+        """
+        Look up a cached response
+
+        Args:
+            key (str): Exact-match key from make_key
+            prompt (str): The prompt, embedded for the semantic lookup
+
+        Returns:
+            Tuple: Cached response or None, and the prompt embedding (if computed)
+                so the caller can hand it back to put() on a miss
+        """
+        response = self._get_entry(key)
+        if response is not None:
+            self._exact_hits += 1
+            return response, None
+
+        embedding = None
+        if self.semantic_enabled:
+            try:
+                embedding = await self._embed(prompt)
+                # The similarity scan is CPU-bound; keep it off the event loop
+                match_key, similarity = await asyncio.to_thread(self._search, embedding)
+                response = self._get_entry(match_key) if match_key is not None else None
+                if response is not None:
+                    self._semantic_hits += 1
+                    self._similarity_total += similarity
+                    return response, embedding
+            except Exception as e:
+                logger.warning("Semantic cache lookup failed: %s", e)
+
+        self._misses += 1
+        return None, embedding
+
+    def put(self, key: str, response: Dict[str, Any], embedding: Optional[np.ndarray] = None) -> None:
+        """
+        Store a model response
+
+        Args:
+            key (str): Exact-match key from make_key
+            response (Dict[str, Any]): Model response to cache
+            embedding (np.ndarray, optional): Normalized prompt embedding from get()
+        """
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+
+        if embedding is not None:
+            keys, matrix = self._index
+            row = embedding.reshape(1, -1)
+            keys = keys + [key]
+            matrix = row if matrix is None else np.vstack((matrix, row))
+
+            # Drop the oldest half of the index once it outgrows the entry limit
+            if len(keys) > self.max_entries:
+                keep = self.max_entries // 2
+                keys, matrix = keys[-keep:], matrix[-keep:]
+
+            self._index = (keys, matrix)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache effectiveness
+
+        Returns:
+            Dict[str, Any]: Hit/miss counters, hit rate and average semantic similarity
+        """
+        hits = self._exact_hits + self._semantic_hits
+        lookups = hits + self._misses
+        return {
+            'entries': len(self._entries),
+            'hits': hits,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'exact_hits': self._exact_hits,
+            'semantic_hits': self._semantic_hits,
+            'misses': self._misses,
+            'avg_similarity': (self._similarity_total / self._semantic_hits
+                               if self._semantic_hits else 0.0)
+        }
+
+    def _get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a live cached response for key, evicting it if expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return response
+
+    def _search(self, embedding: np.ndarray) -> Tuple[Optional[str], float]:
+        """Find the key of the most similar cached prompt above the similarity threshold"""
+        keys, matrix = self._index
+        if matrix is None:
+            return None, 0.0
+
+        # Rows and query are unit vectors, so the dot product is the cosine similarity
+        similarities = matrix @ embedding
+        best = int(np.argmax(similarities))
+        similarity = float(similarities[best])
+        if similarity < self.similarity_threshold:
+            return None, similarity
+
+        return keys[best], similarity
+
+    async def _embed(self, prompt: str) -> np.ndarray:
+        """Compute a normalized Titan embedding for the prompt"""
+        async with self.aws_utils.bedrock_runtime_ctx() as bedrock_runtime:
+            response = await bedrock_runtime.invoke_model(
+                modelId=self.embedding_model_id,
+                body=orjson.dumps({"inputText": prompt})
+            )
+            response_body = orjson.loads(await response['body'].read())
+
+        vector = np.asarray(response_body['embedding'], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
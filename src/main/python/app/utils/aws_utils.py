@@ -1,14 +1,176 @@
+import aioboto3
+import asyncio
 import boto3
-import json
+import configparser
+import http.client
+import io
+import orjson
+import os
+import tempfile
+import threading
+from botocore.config import Config
+from cachetools import LRUCache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from botocore.exceptions import ClientError
-from typing import Dict, Any, List, Union, Optional
+from pathlib import Path
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Tuple, Union, Optional
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import lru_cache
 import logging
-import requests
+import socket
+import time
 
 
 logger = logging.getLogger(__name__)
 
+# Shared client configuration: a larger connection pool with keep-alive so
+# concurrent calls reuse sockets, bounded connect/read timeouts, and adaptive
+# retries for throttling
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 5, 'mode': 'adaptive'},
+    tcp_keepalive=True,
+    connect_timeout=2,
+    read_timeout=60
+)
+
+# Default worker count for the *_many batch helpers; never more threads than
+# the shared client has pooled connections
+DEFAULT_BATCH_CONCURRENCY = min(32, CLIENT_CONFIG.max_pool_connections)
+
+# EC2 instance metadata service (IMDSv2)
+IMDS_HOST = '169.254.169.254'
+IMDS_PORT = 80
+IMDS_TOKEN_TTL_SECONDS = 21600
+IMDS_PROBE_TIMEOUT = 0.05
+IMDS_REQUEST_TIMEOUT = 1
+
+# Read size used when draining streaming response bodies
+STREAM_CHUNK_SIZE = 65536
+
+# Objects larger than this are downloaded as parallel ranged GETs of this size
+S3_RANGE_CHUNK_SIZE = 8 * 1024 * 1024
+S3_RANGE_CONCURRENCY = 8
+
+# Total bytes of small S3 objects kept for conditional re-downloads
+S3_OBJECT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+def _content_length(response: Dict[str, Any]) -> Optional[int]:
+    """Return the Content-Length of a boto3 response, if the service sent one"""
+    length = response.get('ResponseMetadata', {}).get('HTTPHeaders', {}).get('content-length')
+    return int(length) if length is not None else None
+
+def _read_streaming_body(body, size: Optional[int]) -> Union[bytes, memoryview]:
+    """
+    Read a botocore StreamingBody into a single buffer allocated up front
+
+    Chunks are copied straight into place, so the body is never re-buffered
+    or joined. orjson, hashlib and file writes all accept the returned view.
+
+    Args:
+        body: botocore StreamingBody to drain
+        size (int, optional): Expected body size; without it the body is read as bytes
+
+    Returns:
+        memoryview over the filled buffer, or bytes when the size is unknown
+    """
+    if size is None:
+        return body.read()
+
+    view = memoryview(bytearray(size))
+    return view[:_read_into(body, view)]
+
+def _read_into(body, view: memoryview) -> int:
+    """Copy a botocore StreamingBody into view chunk by chunk, returning the bytes written"""
+    offset = 0
+    for chunk in body.iter_chunks(STREAM_CHUNK_SIZE):
+        end = offset + len(chunk)
+        view[offset:end] = chunk
+        offset = end
+    return offset
+
+def _update_ini_file(path: Path, section: str, values: Dict[str, str]) -> bool:
+    """
+    Set values in one section of an INI file, rewriting it only if the content changes
+
+    The file is read once and replaced atomically via a temporary file in the
+    same directory, so readers never observe a partially written file.
+
+    Returns:
+        bool: True if the file was rewritten, False if it already had these values
+    """
+    old_content = path.read_text() if path.exists() else ''
+
+    config = configparser.ConfigParser()
+    config.read_string(old_content)
+    if not config.has_section(section):
+        config.add_section(section)
+    for option, value in values.items():
+        config[section][option] = value
+
+    buffer = io.StringIO()
+    config.write(buffer)
+    new_content = buffer.getvalue()
+    if new_content == old_content:
+        return False
+
+    # mkstemp creates the file readable by the owner only, as credentials should be
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(new_content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+def _imds_request(conn: http.client.HTTPConnection, method: str, path: str, headers: Dict[str, str]) -> bytes:
+    """Send one request to the instance metadata service and return the body"""
+    conn.request(method, path, headers=headers)
+    response = conn.getresponse()
+    body = response.read()
+    if response.status != 200:
+        raise RuntimeError(f"IMDS {method} {path} failed with HTTP {response.status}")
+    return body
+
+@lru_cache(maxsize=None)
+def _get_client(service: str, region: Optional[str], profile: Optional[str]):
+    """
+    Return a process-wide boto3 client for (service, region, profile)
+
+    Low-level clients are thread-safe, so every AWSUtils instance and thread
+    shares one client and its connection pool per service.
+    """
+    session = boto3.Session(profile_name=profile, region_name=region)
+    return session.client(service, config=CLIENT_CONFIG)
+
+# Lambda invocation payload limits for synchronous and asynchronous calls
+LAMBDA_SYNC_PAYLOAD_LIMIT = 6 * 1024 * 1024
+LAMBDA_ASYNC_PAYLOAD_LIMIT = 256 * 1024
+
+def _payload_too_large(body: bytes, limit: int) -> Optional[Dict]:
+    """Return the error result for a Lambda payload over limit, or None if it fits"""
+    if len(body) <= limit:
+        return None
+    error = f"Payload of {len(body)} bytes exceeds the {limit} byte Lambda limit"
+    logger.error(error)
+    return {'StatusCode': 413, 'Error': error}
+
+# Fixed sampling parameters for invoke_bedrock_model. With the default
+# max_tokens everything after the prompt is constant, so it is serialized once.
+BEDROCK_DEFAULT_MAX_TOKENS = 512
+BEDROCK_SAMPLING_PARAMS = {"temperature": 0.7, "top_p": 0.9}
+_BEDROCK_DEFAULT_BODY_SUFFIX = b',' + orjson.dumps(
+    {"max_tokens_to_generate": BEDROCK_DEFAULT_MAX_TOKENS, **BEDROCK_SAMPLING_PARAMS})[1:]
+
+# How long a successful STS caller identity lookup is reused
+IDENTITY_CACHE_TTL_SECONDS = 900
+
 class AWSUtils:
+    # Result of the EC2 probe, shared by every instance for the process lifetime
+    _EC2_DETECTED: Optional[bool] = None
+
     def __init__(self, profile_name: str = None, region: str = None):
         """
         Initialize AWS clients with automatic detection of execution environment.
@@ -18,28 +180,54 @@ class AWSUtils:
             region (str, optional): AWS region to use
         """
         self.is_ec2 = self._is_running_on_ec2()
-        self.session = self._initialize_session(profile_name, region)
-
-        # Initialize clients using the session
-        self.s3_client = self.session.client('s3')
-        self.lambda_client = self.session.client('lambda')
-        self.bedrock_runtime = self.session.client('bedrock-runtime')
-        self.ec2_client = self.session.client('ec2')
-        self.sts_client = self.session.client('sts')
+        if self.is_ec2:
+            logger.info("Running on EC2, using instance metadata for credentials")
+        else:
+            logger.info("Running locally, using profile or environment credentials")
+        self.profile_name = profile_name
+        self.region = region
+        # boto3 sessions are not thread-safe, so each thread builds its own on
+        # first use; the low-level clients in _clients are shared by all threads
+        self._tls = threading.local()
+        self._async_session = None
+        self._clients: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._async_exit_stack: Optional[AsyncExitStack] = None
+        self._async_bedrock_runtime = None
+
+        self._identity_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._instance_metadata: Optional[Dict[str, Any]] = None
+
+        # (bucket, key) -> (etag, content) for conditional S3 downloads
+        self._object_cache: "LRUCache[Tuple[str, str], Tuple[str, bytes]]" = LRUCache(
+            maxsize=S3_OBJECT_CACHE_MAX_BYTES, getsizeof=lambda entry: len(entry[1]))
+        self._object_cache_lock = threading.Lock()
 
     def _is_running_on_ec2(self) -> bool:
         """
         Check if the code is running on an EC2 instance
 
+        The probe runs once per process; later calls return the cached result.
+
         Returns:
             bool: True if running on EC2, False otherwise
         """
-        try:
-            # Try to access EC2 instance metadata service with a timeout of 1 second
-            requests.get('http://169.254.169.254/latest/meta-data/', timeout=1)
+        if AWSUtils._EC2_DETECTED is not None:
+            return AWSUtils._EC2_DETECTED
+
+        # Lambda and ECS advertise themselves through the environment; no network needed
+        if os.getenv('AWS_EXECUTION_ENV') or os.getenv('ECS_CONTAINER_METADATA_URI'):
+            AWSUtils._EC2_DETECTED = True
             return True
-        except (requests.RequestException, requests.Timeout):
-            return False
+
+        try:
+            # A TCP connect to the link-local metadata address is enough to tell
+            # EC2 apart; it skips the HTTP stack and fails fast everywhere else
+            probe = socket.create_connection((IMDS_HOST, IMDS_PORT), IMDS_PROBE_TIMEOUT)
+            probe.close()
+            AWSUtils._EC2_DETECTED = True
+        except OSError:
+            AWSUtils._EC2_DETECTED = False
+        return AWSUtils._EC2_DETECTED
 
     def _initialize_session(self, profile_name: str = None, region: str = None) -> boto3.Session:
         """
@@ -53,12 +241,132 @@ class AWSUtils:
             boto3.Session: Configured AWS session
         """
         if self.is_ec2:
-            logger.info("Running on EC2, using instance metadata for credentials")
             return boto3.Session(region_name=region)
         else:
-            logger.info("Running locally, using profile or environment credentials")
             return boto3.Session(profile_name=profile_name, region_name=region)
 
+    @property
+    def session(self) -> boto3.Session:
+        """
+        boto3 session for the calling thread, for resource-level APIs
+
+        Returns:
+            boto3.Session: Session owned by the current thread
+        """
+        session = getattr(self._tls, 'session', None)
+        if session is None:
+            session = self._tls.session = self._initialize_session(self.profile_name, self.region)
+        return session
+
+    def _client(self, service: str, region: Optional[str] = None):
+        """
+        Get the shared client for a service, created on first use so a process
+        that only talks to one service never loads the others' service models
+
+        Args:
+            service (str): AWS service name
+            region (str, optional): Region to use when this object has none configured
+        """
+        key = (service, self.region or region)
+        client = self._clients.get(key)
+        if client is None:
+            profile = None if self.is_ec2 else self.profile_name
+            client = self._clients[key] = _get_client(service, key[1], profile)
+        return client
+
+    @property
+    def s3_client(self):
+        return self._client('s3')
+
+    @property
+    def lambda_client(self):
+        return self._client('lambda')
+
+    @property
+    def bedrock_runtime(self):
+        return self._client('bedrock-runtime')
+
+    @property
+    def ec2_client(self):
+        return self._client('ec2')
+
+    @property
+    def sts_client(self):
+        return self._client('sts')
+
+    @property
+    def async_session(self) -> aioboto3.Session:
+        """
+        Lazily build the aioboto3 session used by async callers
+
+        Returns:
+            aioboto3.Session: Configured async AWS session
+        """
+        if self._async_session is None:
+            if self.is_ec2:
+                self._async_session = aioboto3.Session(region_name=self.region)
+            else:
+                self._async_session = aioboto3.Session(profile_name=self.profile_name,
+                                                       region_name=self.region)
+        return self._async_session
+
+    async def open_async_clients(self) -> None:
+        """
+        Open a long-lived async bedrock-runtime client shared by all callers,
+        so its connection pool and keep-alive sockets survive across requests
+        """
+        if self._async_bedrock_runtime is not None:
+            return
+
+        exit_stack = AsyncExitStack()
+        self._async_bedrock_runtime = await exit_stack.enter_async_context(
+            self.async_session.client('bedrock-runtime', config=CLIENT_CONFIG)
+        )
+        self._async_exit_stack = exit_stack
+
+    async def close_async_clients(self) -> None:
+        """
+        Close the long-lived async clients opened by open_async_clients
+        """
+        if self._async_exit_stack is not None:
+            await self._async_exit_stack.aclose()
+        self._async_exit_stack = None
+        self._async_bedrock_runtime = None
+
+    async def warm_up(self) -> None:
+        """
+        Do the per-process setup work before the first request arrives:
+        resolve credentials, load the bedrock-runtime service model and
+        endpoint, and open the STS connection via a caller identity lookup
+        """
+        await self.open_async_clients()
+
+        # Warm-up is best effort; a missing or expired credential should
+        # surface on the first real request, not prevent startup
+        try:
+            account_id = await asyncio.to_thread(self.get_current_account_id)
+            logger.info("AWS clients warmed up for account: %s", account_id)
+        except Exception as e:
+            logger.warning("AWS client warm-up failed: %s", e)
+
+    @asynccontextmanager
+    async def bedrock_runtime_ctx(self):
+        """
+        Async context manager yielding a non-blocking bedrock-runtime client
+
+        Yields the shared client when open_async_clients has been called,
+        otherwise a client scoped to the context.
+
+        Yields:
+            Async bedrock-runtime client
+        """
+        if self._async_bedrock_runtime is not None:
+            yield self._async_bedrock_runtime
+            return
+
+        async with self.async_session.client('bedrock-runtime', config=CLIENT_CONFIG) as client:
+            yield client
+
     def setup_local_credentials(self,
                                 aws_access_key_id: str,
                                 aws_secret_access_key: str,
@@ -85,74 +393,62 @@ class AWSUtils:
             aws_dir = Path.home() / '.aws'
             aws_dir.mkdir(exist_ok=True)
 
-            # Initialize config parser
-            config = configparser.ConfigParser()
-
-            # Read existing credentials file if it exists
-            credentials_file = aws_dir / 'credentials'
-            if credentials_file.exists():
-                config.read(credentials_file)
-
-            # Add or update profile
-            if not config.has_section(profile_name):
-                config.add_section(profile_name)
-
-            config[profile_name]['aws_access_key_id'] = aws_access_key_id
-            config[profile_name]['aws_secret_access_key'] = aws_secret_access_key
-
-            # Write credentials file
-            with open(credentials_file, 'w') as f:
-                config.write(f)
-
-            # Update config file with region
-            config_file = aws_dir / 'config'
-            config = configparser.ConfigParser()
-
-            if config_file.exists():
-                config.read(config_file)
+            credentials_changed = _update_ini_file(aws_dir / 'credentials', profile_name, {
+                'aws_access_key_id': aws_access_key_id,
+                'aws_secret_access_key': aws_secret_access_key
+            })
 
             profile_section = f"profile {profile_name}" if profile_name != "default" else "default"
-            if not config.has_section(profile_section):
-                config.add_section(profile_section)
-
-            config[profile_section]['region'] = region
-
-            with open(config_file, 'w') as f:
-                config.write(f)
-
-            # Reinitialize the session with new credentials
-            self.session = self._initialize_session(profile_name, region)
-
-            # Reinitialize clients with new session
-            self.s3_client = self.session.client('s3')
-            self.lambda_client = self.session.client('lambda')
-            self.bedrock_runtime = self.session.client('bedrock-runtime')
-            self.ec2_client = self.session.client('ec2')
-            self.sts_client = self.session.client('sts')
-
-            logger.info(f"Successfully set up AWS credentials for profile: {profile_name}")
+            config_changed = _update_ini_file(aws_dir / 'config', profile_section, {'region': region})
+
+            if not (credentials_changed or config_changed
+                    or profile_name != self.profile_name or region != self.region):
+                logger.info("AWS credentials for profile %s are already up to date", profile_name)
+                return True
+
+            # Point at the new profile; clients and cached identity hold the old
+            # credentials, so drop them and let them rebuild on next use
+            self.profile_name = profile_name
+            self.region = region
+            self._tls = threading.local()
+            self._async_session = None
+            self._clients.clear()
+            _get_client.cache_clear()
+            self._identity_cache = None
+
+            logger.info("Successfully set up AWS credentials for profile: %s", profile_name)
             return True
 
         except Exception as e:
-            logger.error(f"Error setting up AWS credentials: {str(e)}")
+            logger.error("Error setting up AWS credentials: %s", e)
             return False
 
     def verify_credentials(self) -> Dict[str, Any]:
         """
         Verify AWS credentials are working and return account information
 
+        A valid result is reused for IDENTITY_CACHE_TTL_SECONDS, so repeated
+        calls do not each pay an STS round-trip.
+
         Returns:
             dict: Account information and credentials status
         """
+        if self._identity_cache is not None:
+            cached_at, identity = self._identity_cache
+            if time.monotonic() - cached_at < IDENTITY_CACHE_TTL_SECONDS:
+                return dict(identity)
+
         try:
             response = self.sts_client.get_caller_identity()
-            return {
+            identity = {
                 'status': 'valid',
                 'account_id': response['Account'],
                 'arn': response['Arn'],
                 'user_id': response['UserId'],
                 'environment': 'ec2' if self.is_ec2 else 'local'
             }
+            self._identity_cache = (time.monotonic(), identity)
+            return dict(identity)
         except Exception as e:
             return {
                 'status': 'invalid',
@@ -172,30 +468,124 @@ class AWSUtils:
             self.s3_client.put_object(Bucket=bucket, Key=key, Body=file_content)
             return True
         except ClientError as e:
-            logger.error(f"Error uploading to S3: {str(e)}")
+            logger.error("Error uploading to S3: %s", e)
             return False
 
-    def download_from_s3(self, bucket: str, key: str) -> Union[bytes, None]:
+    def download_from_s3(self, bucket: str, key: str) -> Union[bytes, bytearray, None]:
         """
         Download content from S3 bucket
+
+        Objects larger than S3_RANGE_CHUNK_SIZE are fetched as concurrent
+        ranged GETs into one preallocated bytearray. Smaller objects are kept
+        in memory and only transferred again once their ETag changes.
+        """
+        with self._object_cache_lock:
+            cached = self._object_cache.get((bucket, key))
+
+        try:
+            try:
+                head_params = {'IfNoneMatch': cached[0]} if cached else {}
+                head = self.s3_client.head_object(Bucket=bucket, Key=key, **head_params)
+            except ClientError as e:
+                # Not Modified: the cached copy is still current
+                if cached and e.response['Error']['Code'] == '304':
+                    return cached[1]
+                raise
+
+            size = head['ContentLength']
+            if size <= S3_RANGE_CHUNK_SIZE:
+                response = self.s3_client.get_object(Bucket=bucket, Key=key)
+                content = response['Body'].read()
+                with self._object_cache_lock:
+                    self._object_cache[(bucket, key)] = (response['ETag'], content)
+                return content
+
+            # Large objects: fetch byte ranges over several pooled connections,
+            # each written straight into its place in one buffer
+            buffer = bytearray(size)
+            self._download_ranges(bucket, key, head['ETag'], memoryview(buffer))
+            return buffer
+        except ClientError as e:
+            logger.error("Error downloading from S3: %s", e)
+            return None
+
+    def download_from_s3_view(self, bucket: str, key: str) -> Optional[memoryview]:
+        """
+        Download content from S3 bucket into a buffer sized from Content-Length
+
+        The body is copied once, into its final place; orjson.loads, hashlib
+        and put_object all accept the returned memoryview directly.
         """
         try:
             response = self.s3_client.get_object(Bucket=bucket, Key=key)
-            return response['Body'].read()
+            return _read_streaming_body(response['Body'], response['ContentLength'])
         except ClientError as e:
-            logger.error(f"Error downloading from S3: {str(e)}")
+            logger.error("Error downloading from S3: %s", e)
             return None
 
-    def list_s3_objects(self, bucket: str, prefix: str = '') -> List[Dict]:
+    def _download_ranges(self, bucket: str, key: str, etag: str, view: memoryview) -> None:
+        """Fill view with the object's content using concurrent ranged GETs"""
+        def fetch(start: int) -> None:
+            end = min(start + S3_RANGE_CHUNK_SIZE, len(view))
+            # IfMatch fails the read if the object is replaced between ranges
+            response = self.s3_client.get_object(Bucket=bucket, Key=key, IfMatch=etag,
+                                                 Range=f'bytes={start}-{end - 1}')
+            _read_into(response['Body'], view[start:end])
+
+        starts = range(0, len(view), S3_RANGE_CHUNK_SIZE)
+        with ThreadPoolExecutor(max_workers=min(S3_RANGE_CONCURRENCY, len(starts))) as executor:
+            # Consume the results so a failed range raises here
+            for _ in executor.map(fetch, starts):
+                pass
+
+    def list_s3_objects(self, bucket: str, prefix: str = '') -> Iterator[Dict]:
         """
-        List objects in S3 bucket with optional prefix
+        Lazily list every object in S3 bucket with optional prefix, one page at a time
         """
         try:
-            response = self.s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
-            return response.get('Contents', [])
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            pages = paginator.paginate(Bucket=bucket, Prefix=prefix,
+                                       PaginationConfig={'PageSize': 1000})
+            for page in pages:
+                yield from page.get('Contents', [])
         except ClientError as e:
-            logger.error(f"Error listing S3 objects: {str(e)}")
-            return []
+            logger.error("Error listing S3 objects: %s", e)
+
+    def list_s3_objects_materialized(self, bucket: str, prefix: str = '') -> List[Dict]:
+        """
+        List every object in S3 bucket with optional prefix as a list
+        """
+        return list(self.list_s3_objects(bucket, prefix))
+
+    def upload_many(self,
+                    items: Iterable[Tuple[Union[bytes, str], str, str]],
+                    concurrency: int = DEFAULT_BATCH_CONCURRENCY) -> List[bool]:
+        """
+        Upload many objects to S3 concurrently over the shared client
+
+        Args:
+            items: (file_content, bucket, key) tuples
+            concurrency (int): Maximum number of uploads in flight
+
+        Returns:
+            list: Upload success flag for each item, in input order
+        """
+        return self._run_concurrently(self.upload_to_s3, list(items), concurrency, False)
+
+    def download_many(self,
+                      items: Iterable[Tuple[str, str]],
+                      concurrency: int = DEFAULT_BATCH_CONCURRENCY) -> List[Union[bytes, bytearray, None]]:
+        """
+        Download many objects from S3 concurrently over the shared client
+
+        Args:
+            items: (bucket, key) tuples
+            concurrency (int): Maximum number of downloads in flight
+
+        Returns:
+            list: Object content (or None on failure) for each item, in input order
+        """
+        return self._run_concurrently(self.download_from_s3, list(items), concurrency, None)
 
     # Lambda Operations
     def invoke_lambda(self, function_name: str, payload: Dict[str, Any]) -> Dict:
@@ -203,19 +593,89 @@ class AWSUtils:
         Invoke AWS Lambda function
         """
         try:
+            # Lambda would reject an oversized payload anyway; fail before the round-trip
+            body = orjson.dumps(payload)
+            too_large = _payload_too_large(body, LAMBDA_SYNC_PAYLOAD_LIMIT)
+            if too_large:
+                return too_large
+
             response = self.lambda_client.invoke(
                 FunctionName=function_name,
                 InvocationType='RequestResponse',
-                Payload=json.dumps(payload)
+                Payload=body
             )
             return {
                 'StatusCode': response['StatusCode'],
-                'Payload': json.loads(response['Payload'].read().decode('utf-8'))
+                'Payload': orjson.loads(_read_streaming_body(response['Payload'], _content_length(response)))
             }
         except ClientError as e:
-            logger.error(f"Error invoking Lambda function: {str(e)}")
+            logger.error("Error invoking Lambda function: %s", e)
             return {'StatusCode': 500, 'Error': str(e)}
 
+    def invoke_lambda_async(self, function_name: str, payload: Dict[str, Any]) -> Dict:
+        """
+        Queue an asynchronous AWS Lambda invocation and return without waiting for it
+
+        Lambda accepts the event and responds with 202 once it is queued; the
+        function's result is not returned. Asynchronous payloads are limited
+        to 256 KB, against 6 MB for invoke_lambda, so use invoke_lambda when
+        the response body is needed or the payload is larger.
+        """
+        try:
+            body = orjson.dumps(payload)
+            too_large = _payload_too_large(body, LAMBDA_ASYNC_PAYLOAD_LIMIT)
+            if too_large:
+                return too_large
+
+            response = self.lambda_client.invoke(
+                FunctionName=function_name,
+                InvocationType='Event',
+                Payload=body
+            )
+            return {'StatusCode': response['StatusCode']}
+        except ClientError as e:
+            logger.error("Error invoking Lambda function asynchronously: %s", e)
+            return {'StatusCode': 500, 'Error': str(e)}
+
+    def invoke_lambda_many(self,
+                           items: Iterable[Tuple[str, Dict[str, Any]]],
+                           concurrency: int = DEFAULT_BATCH_CONCURRENCY) -> List[Dict]:
+        """
+        Invoke many Lambda functions concurrently over the shared client
+
+        Args:
+            items: (function_name, payload) tuples
+            concurrency (int): Maximum number of invocations in flight
+
+        Returns:
+            list: invoke_lambda result for each item, in input order
+        """
+        return self._run_concurrently(self.invoke_lambda, list(items), concurrency,
+                                      {'StatusCode': 500, 'Error': 'Invocation failed'})
+
+    def _run_concurrently(self, func: Callable, calls: List[tuple], concurrency: int, default: Any) -> List:
+        """
+        Run func once per argument tuple on a thread pool
+
+        boto3 low-level clients are thread-safe, so every worker shares the
+        same client and its connection pool.
+
+        Returns:
+            list: Result for each call in input order; default where the call raised
+        """
+        results = [default] * len(calls)
+        if not calls:
+            return results
+
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(calls)))) as executor:
+            futures = {executor.submit(func, *args): index for index, args in enumerate(calls)}
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    logger.error("Error in concurrent %s: %s", func.__name__, e)
+        return results
+
     def list_lambda_functions(self) -> List[str]:
         """
         List all Lambda functions
@@ -224,34 +684,37 @@ class AWSUtils:
             response = self.lambda_client.list_functions()
             return [function['FunctionName'] for function in response['Functions']]
         except ClientError as e:
-            logger.error(f"Error listing Lambda functions: {str(e)}")
+            logger.error("Error listing Lambda functions: %s", e)
             return []
 
     # Bedrock Runtime Operations
     def invoke_bedrock_model(self,
                              model_id: str,
                              prompt: str,
-                             max_tokens: int = 512) -> Dict:
+                             max_tokens: int = BEDROCK_DEFAULT_MAX_TOKENS) -> Dict:
         """
         Invoke Amazon Bedrock model
         """
         try:
-            request_body = {
-                "prompt": prompt,
-                "max_tokens_to_generate": max_tokens,
-                "temperature": 0.7,
-                "top_p": 0.9,
-            }
+            if max_tokens == BEDROCK_DEFAULT_MAX_TOKENS:
+                # Only the prompt needs encoding; the rest is the prebuilt suffix
+                request_body = b'{"prompt":' + orjson.dumps(prompt) + _BEDROCK_DEFAULT_BODY_SUFFIX
+            else:
+                request_body = orjson.dumps({
+                    "prompt": prompt,
+                    "max_tokens_to_generate": max_tokens,
+                    **BEDROCK_SAMPLING_PARAMS
+                })
 
             response = self.bedrock_runtime.invoke_model(
                 modelId=model_id,
-                body=json.dumps(request_body)
+                body=request_body
             )
 
-            response_body = json.loads(response.get('body').read())
+            response_body = orjson.loads(_read_streaming_body(response['body'], _content_length(response)))
             return response_body
         except ClientError as e:
-            logger.error(f"Error invoking Bedrock model: {str(e)}")
+            logger.error("Error invoking Bedrock model: %s", e)
             return {'error': str(e)}
 
     def get_account_id_from_lambda_arn(self, lambda_arn: str) -> Optional[str]:
@@ -267,12 +730,16 @@ class AWSUtils:
         """
         try:
             # ARN format: arn:aws:lambda:region:account-id:function:function-name
-            arn_parts = lambda_arn.split(':')
-            if len(arn_parts) >= 5:
-                return arn_parts[4]
-            return None
+            # Walk to the 4th colon with str.find instead of splitting the whole ARN
+            start = 0
+            for _ in range(4):
+                start = lambda_arn.find(':', start) + 1
+                if start == 0:
+                    return None
+            end = lambda_arn.find(':', start)
+            return lambda_arn[start:end] if end != -1 else lambda_arn[start:]
         except Exception as e:
-            logger.error(f"Error parsing Lambda ARN: {str(e)}")
+            logger.error("Error parsing Lambda ARN: %s", e)
             return None
 
     def get_lambda_function_arn(self, function_name: str) -> Optional[str]:
@@ -289,51 +756,84 @@ class AWSUtils:
             response = self.lambda_client.get_function(FunctionName=function_name)
             return response['Configuration']['FunctionArn']
         except ClientError as e:
-            logger.error(f"Error getting Lambda function ARN: {str(e)}")
+            logger.error("Error getting Lambda function ARN: %s", e)
             return None
 
     def get_current_account_id(self) -> Optional[str]:
         """
-        Get the current AWS account ID using STS
+        Get the current AWS account ID from the cached STS caller identity
 
         Returns:
             str: AWS account ID or None if failed
         """
-        try:
-            response = self.sts_client.get_caller_identity()
-            return response['Account']
-        except ClientError as e:
-            logger.error(f"Error getting AWS account ID: {str(e)}")
+        identity = self.verify_credentials()
+        if identity['status'] != 'valid':
+            logger.error("Error getting AWS account ID: %s", identity['error'])
             return None
+        return identity['account_id']
+
+    def _get_instance_identity_document(self) -> Dict[str, Any]:
+        """
+        Fetch the instance identity document from IMDSv2
+
+        Returns:
+            dict: Identity document with instanceId, region, availabilityZone, etc.
+        """
+        # Both requests go over one keep-alive connection to the metadata service
+        conn = http.client.HTTPConnection(IMDS_HOST, IMDS_PORT, timeout=IMDS_REQUEST_TIMEOUT)
+        try:
+            token = _imds_request(conn, 'PUT', '/latest/api/token', {
+                'X-aws-ec2-metadata-token-ttl-seconds': str(IMDS_TOKEN_TTL_SECONDS)
+            })
+            document = _imds_request(conn, 'GET', '/latest/dynamic/instance-identity/document', {
+                'X-aws-ec2-metadata-token': token.decode('ascii')
+            })
+        finally:
+            conn.close()
+        return orjson.loads(document)
 
     def get_instance_metadata(self) -> Dict[str, Any]:
         """
-        Get metadata about the current EC2 instance
+        Get metadata about the current EC2 instance, cached for the lifetime of this object
 
         Returns:
             dict: Instance metadata including AZ, instance ID, and region
         """
+        if self._instance_metadata is not None:
+            return dict(self._instance_metadata)
+
         try:
-            # Get instance ID from instance metadata service
-            instance_identity = boto3.client('ec2').describe_instances()
-
-            # Extract relevant information from the first instance
-            reservations = instance_identity['Reservations']
-            if reservations and reservations[0]['Instances']:
-                instance = reservations[0]['Instances'][0]
-                return {
-                    'instance_id': instance['InstanceId'],
-                    'availability_zone': instance['Placement']['AvailabilityZone'],
-                    'region': instance['Placement']['AvailabilityZone'][:-1],  # Remove AZ letter to get region
-                    'instance_type': instance['InstanceType'],
-                    'private_ip': instance.get('PrivateIpAddress'),
-                    'public_ip': instance.get('PublicIpAddress'),
-                    'vpc_id': instance.get('VpcId'),
-                    'subnet_id': instance.get('SubnetId')
-                }
-            return {}
+            # The instance identity document describes this host in one local call
+            identity = self._get_instance_identity_document()
+            instance_id = identity['instanceId']
+            metadata = {
+                'instance_id': instance_id,
+                'availability_zone': identity['availabilityZone'],
+                'region': identity['region'],
+                'instance_type': identity['instanceType'],
+                'private_ip': identity.get('privateIp'),
+                'public_ip': None,
+                'vpc_id': None,
+                'subnet_id': None
+            }
+
+            # Network details are not in the identity document; look up this instance only
+            try:
+                ec2_client = self._client('ec2', region=identity['region'])
+                instance_identity = ec2_client.describe_instances(InstanceIds=[instance_id])
+                reservations = instance_identity['Reservations']
+                if reservations and reservations[0]['Instances']:
+                    instance = reservations[0]['Instances'][0]
+                    metadata['public_ip'] = instance.get('PublicIpAddress')
+                    metadata['vpc_id'] = instance.get('VpcId')
+                    metadata['subnet_id'] = instance.get('SubnetId')
+            except ClientError as e:
+                logger.warning("Could not describe instance %s: %s", instance_id, e)
+
+            self._instance_metadata = metadata
+            return dict(metadata)
         except Exception as e:
-            logger.error(f"Error getting instance metadata: {str(e)}")
+            logger.error("Error getting instance metadata: %s", e)
             return {}
 
     def get_account_id_from_az(self, availability_zone: Optional[str] = None) -> Optional[str]:
@@ -356,10 +856,10 @@ class AWSUtils:
             if not availability_zone:
                 raise ValueError("Could not determine availability zone")
 
-            # Use STS to get account ID
+            # Use the cached STS lookup to get account ID
             return self.get_current_account_id()
         except Exception as e:
-            logger.error(f"Error getting account ID from AZ: {str(e)}")
+            logger.error("Error getting account ID from AZ: %s", e)
             return None
 
 # # Example test setup
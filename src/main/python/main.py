@@ -1,6 +1,6 @@
 import os
+import uvicorn
 from dotenv import load_dotenv
-from app import create_app
 from app.utils.logger import setup_logger
 
 # Set up logging
@@ -11,15 +11,24 @@ load_dotenv()
 
 def main():
     try:
-        app = create_app()
         host = os.getenv('HOST', '0.0.0.0')
         port = int(os.getenv('PORT', 5001))
         debug = os.getenv('DEBUG', 'False').lower() == 'true'
+        workers = int(os.getenv('WORKERS', os.cpu_count() or 1))
 
-        logger.info(f"Starting application on {host}:{port}")
-        app.run(host=host, port=port, debug=debug)
+        logger.info("Starting application on %s:%s with %s workers", host, port, workers)
+        # uvloop and httptools replace the pure-Python event loop and HTTP parser
+        uvicorn.run(
+            "app:app",
+            host=host,
+            port=port,
+            reload=debug,
+            workers=None if debug else workers,
+            loop="uvloop",
+            http="httptools"
+        )
     except Exception as e:
-        logger.error(f"Failed to start application: {str(e)}")
+        logger.error("Failed to start application: %s", e)
         raise
 
 if __name__ == '__main__':